@@ -1,12 +1,15 @@
 """API package for asmblr_backend."""
 
+import os
+import threading
+from functools import lru_cache
 from flask import Flask
 from .health import health_bp
 from .commands import commands_bp
 from .system import system_bp
 from .geolipi import geolipi_bp
 from .sysl import sysl_bp
-from .migumi import migumi_bp
+from .migumi import migumi_bp, warmup as migumi_warmup
 
 # Optional: decor_gumi module (only if decor_gumi package is installed)
 try:
@@ -17,18 +20,28 @@ except ImportError:
     decorgumi_bp = None
 
 
-def register_blueprints(app: Flask):
-    """Register all API blueprints."""
-    app.register_blueprint(health_bp)
-    app.register_blueprint(commands_bp)
-    app.register_blueprint(system_bp)
-    app.register_blueprint(geolipi_bp)
-    app.register_blueprint(sysl_bp)
-    app.register_blueprint(migumi_bp)
+@lru_cache(maxsize=1)
+def _collect_blueprints():
+    """Blueprints to register, built once and shared by every app instance."""
+    blueprints = [health_bp, commands_bp, system_bp, geolipi_bp, sysl_bp, migumi_bp]
     
-    # Register optional blueprints
+    # Optional blueprints
     if DECOR_GUMI_AVAILABLE:
-        app.register_blueprint(decorgumi_bp)
+        blueprints.append(decorgumi_bp)
         print("[asmblr_backend] DecorGumi API enabled")
     else:
         print("[asmblr_backend] DecorGumi API disabled (decor_gumi package not installed)")
+    return tuple(blueprints)
+
+
+def register_blueprints(app: Flask):
+    """Register all API blueprints."""
+    for bp in _collect_blueprints():
+        app.register_blueprint(bp)
+
+
+def warmup_shaders():
+    """Warm the shader compilers in a background thread (disable with ASMBLR_WARMUP=0)."""
+    if os.getenv('ASMBLR_WARMUP', '1') == '0':
+        return
+    threading.Thread(target=migumi_warmup, name='asmblr-warmup', daemon=True).start()
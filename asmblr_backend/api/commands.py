@@ -6,52 +6,289 @@ in trusted development environments. DO NOT deploy to production without
 implementing proper command whitelisting and authentication.
 """
 
+import atexit
+import io
+import logging
+import os
+import re
+import selectors
+import shlex
 import subprocess
 import threading
+import time
 import uuid
-from flask import Blueprint, request, jsonify
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from typing import Optional
+import orjson
+from flask import Blueprint, Response, request
+
+from asmblr_backend.utils import json_response, payload
 
 commands_bp = Blueprint('commands', __name__, url_prefix='/api/commands')
+log = logging.getLogger(__name__)
+
+# Fixed error responses, encoded once: (body, status)
+_ERR_CMD_REQUIRED = (orjson.dumps({'error': 'Command is required'}), 400)
+_ERR_NOT_ALLOWED = (orjson.dumps({'error': 'Command not in allowed whitelist'}), 403)
+_ERR_NOT_FOUND = (orjson.dumps({'error': 'Command not found'}), 404)
+_ERR_TIMED_OUT = (orjson.dumps({'error': 'Command timed out'}), 408)
+_ERR_BUSY = (orjson.dumps({'error': 'Too many pending commands, retry later'}), 503)
+
+
+def _error_response(error, headers=None) -> Response:
+    """Build a response from a precomputed (body, status) error."""
+    return Response(*error, headers=headers, mimetype='application/json')
 
-# In-memory storage for async commands
+# In-memory storage for async commands (bounded, oldest finished entries evicted first)
+MAX_COMMANDS = 4096
+COMMAND_TTL = 3600  # seconds before a finished command may be dropped
+RETRY_AFTER = '1'  # seconds clients are asked to wait when the command queue is full
 commands = {}
+_finished = deque()  # (finished_at, command_id) in completion order
+_lock = threading.Lock()
 
-# Allowed commands whitelist (add commands as needed)
-# Set to None to allow all commands (DANGEROUS - development only)
-ALLOWED_COMMANDS = None  # TODO: Define whitelist for production
+# Shared worker pool for async commands
+MAX_WORKERS = int(os.getenv('ASMBLR_CMD_WORKERS', '8'))
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='asmblr-cmd')
+atexit.register(_executor.shutdown, wait=False)
 
+# Backpressure: at most this many async commands may be pending or running at once.
+# Never above MAX_COMMANDS, since unfinished entries cannot be evicted from the store.
+MAX_QUEUED = min(int(os.getenv('ASMBLR_CMD_QUEUE', '256')), MAX_COMMANDS)
+_slots = threading.BoundedSemaphore(MAX_QUEUED)
+
+# Captured stdout/stderr is capped per stream; only the most recent output is kept
+MAX_OUTPUT_BYTES = 4 * 1024 * 1024
+ASYNC_TIMEOUT = 300  # seconds
+MAX_WAIT_MS = 30000  # longest a status request may block waiting for completion
+MAX_STATUS_IDS = 256  # command IDs accepted by one batch status request
+STREAM_KEEPALIVE = 15  # seconds between keep-alive comments on idle event streams
+
+# Optional: Redis/RQ-backed command store, shared across server worker processes.
+# Enabled when REDIS_URL is set and redis/rq are installed; jobs then run in `rq worker asmblr_commands`.
+REDIS_URL = os.getenv('REDIS_URL')
+_queue = None
+if REDIS_URL:
+    try:
+        import redis
+        from rq import Queue
+        from rq.job import Job
+        from rq.exceptions import NoSuchJobError
+        from rq.registry import StartedJobRegistry, FinishedJobRegistry, FailedJobRegistry
+        _queue = Queue('asmblr_commands', connection=redis.Redis.from_url(REDIS_URL))
+    except ImportError:
+        log.warning("REDIS_URL is set but redis/rq are not installed; using in-memory command store")
 
-def _is_command_allowed(cmd: str) -> bool:
-    """Check if a command is in the allowed whitelist."""
+# RQ job states mapped onto the in-memory store's status names
+_RQ_STATUS = {
+    'queued': 'pending',
+    'deferred': 'pending',
+    'scheduled': 'pending',
+    'started': 'running',
+    'failed': 'error',
+    'stopped': 'error',
+    'canceled': 'error',
+}
+
+# Allowed commands whitelist, read once from ASMBLR_ALLOWED_CMDS (comma-separated)
+# None allows all commands (DANGEROUS - development only)
+_allowed_env = os.getenv('ASMBLR_ALLOWED_CMDS')
+ALLOWED_COMMANDS: Optional[frozenset[str]] = (
+    frozenset(name.strip() for name in _allowed_env.split(',') if name.strip())
+    if _allowed_env is not None else None
+)
+
+
+def _is_command_allowed(argv: list[str]) -> bool:
+    """Check if a command's executable is in the allowed whitelist."""
     if ALLOWED_COMMANDS is None:
         return True  # Allow all (development mode)
     
-    # Check if the base command is in the whitelist
-    base_cmd = cmd.split()[0] if cmd.split() else ""
-    return base_cmd in ALLOWED_COMMANDS
+    # Check the resolved executable, after parameter substitution
+    return argv[0] in ALLOWED_COMMANDS
+
+
+# Random bytes for command IDs, drawn from os.urandom in batches (one syscall per batch)
+_ID_BATCH = 256
+_id_pool = b''
+_id_offset = 0
+_id_lock = threading.Lock()
+
+
+def _new_command_id() -> str:
+    """Generate a random UUID4 string for an async command."""
+    global _id_pool, _id_offset
+    with _id_lock:
+        if _id_offset >= len(_id_pool):
+            _id_pool, _id_offset = os.urandom(16 * _ID_BATCH), 0
+        raw = _id_pool[_id_offset:_id_offset + 16]
+        _id_offset += 16
+    return str(uuid.UUID(bytes=raw, version=4))
+
+
+@dataclass(slots=True)
+class CmdRecord:
+    """In-memory state of an async command."""
+    command: str
+    status: str = 'pending'
+    stdout: Optional[str] = None
+    stderr: Optional[str] = None
+    return_code: Optional[int] = None
+    error: Optional[str] = None
+    done: threading.Event = field(default_factory=threading.Event)
+    
+    def to_dict(self) -> dict:
+        """Return the client-visible fields, omitting unset results."""
+        data = {f.name: getattr(self, f.name) for f in fields(self) if f.name != 'done'}
+        return {key: value for key, value in data.items() if value is not None}
+
+
+def _evict_commands():
+    """
+    Drop expired and excess finished commands, oldest first. Caller must hold ``_lock``.
+    
+    Stops at the first finished entry that is still fresh, so the cost is
+    proportional to the number of entries dropped, not the store size.
+    """
+    now = time.monotonic()
+    while _finished and (len(commands) > MAX_COMMANDS or now - _finished[0][0] > COMMAND_TTL):
+        del commands[_finished.popleft()[1]]
+
+
+def _update_command(command_id, **updates):
+    """Update a stored command entry, if it is still present."""
+    with _lock:
+        entry = commands.get(command_id)
+        if entry is not None:
+            for name, value in updates.items():
+                setattr(entry, name, value)
+
+
+# `{name}` placeholders; any other braces (e.g. awk programs) are left as-is
+_PLACEHOLDER = re.compile(r'\{([a-zA-Z_][a-zA-Z0-9_]*)\}')
+
+
+@lru_cache(maxsize=512)
+def _compile_template(cmd: str) -> tuple[tuple[str, ...], ...]:
+    """
+    Split a command template shell-style, then split each token into
+    alternating literal and placeholder-name pieces.
+    """
+    return tuple(tuple(_PLACEHOLDER.split(token)) for token in shlex.split(cmd))
+
+
+def _materialize(cmd: str, params: dict) -> list[str]:
+    """
+    Split the command into an argv list and substitute ``{key}`` placeholders.
+    
+    The template is tokenized before substitution, so a value always stays
+    within its own argument: spaces and quotes in params are never
+    reinterpreted.
+    """
+    argv = []
+    for pieces in _compile_template(cmd):
+        # Single pass: substituted values are never re-scanned for placeholders
+        out = list(pieces)
+        for i in range(1, len(pieces), 2):
+            name = pieces[i]
+            out[i] = str(params[name]) if name in params else '{' + name + '}'
+        argv.append(''.join(out))
+    return argv
 
 
-def run_command(command_id, cmd, params):
-    """Execute command and store result."""
+def _run_capped(argv: list[str], timeout: float) -> tuple[int, str, str]:
+    """
+    Run argv, streaming stdout/stderr into bounded buffers.
+    
+    Output beyond MAX_OUTPUT_BYTES per stream is dropped from the front, so
+    a runaway command cannot exhaust server memory.
+    
+    Returns:
+        tuple: (return_code, stdout, stderr)
+    
+    Raises:
+        subprocess.TimeoutExpired: If the command runs longer than timeout (it is killed)
+    """
+    deadline = time.monotonic() + timeout
+    with subprocess.Popen(argv, stdout=subprocess.PIPE, stderr=subprocess.PIPE) as proc:
+        buffers = {proc.stdout: bytearray(), proc.stderr: bytearray()}
+        try:
+            with selectors.DefaultSelector() as selector:
+                for stream in buffers:
+                    selector.register(stream, selectors.EVENT_READ)
+                
+                while selector.get_map():
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise subprocess.TimeoutExpired(argv, timeout)
+                    
+                    for key, _ in selector.select(remaining):
+                        chunk = os.read(key.fd, io.DEFAULT_BUFFER_SIZE)
+                        if not chunk:
+                            selector.unregister(key.fileobj)
+                            continue
+                        buffer = buffers[key.fileobj]
+                        buffer += chunk
+                        if len(buffer) > MAX_OUTPUT_BYTES:
+                            del buffer[:len(buffer) - MAX_OUTPUT_BYTES]
+            
+            proc.wait(timeout=max(deadline - time.monotonic(), 0))
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            raise
+    
+    stdout, stderr = (buffers[stream].decode('utf-8', errors='replace') for stream in (proc.stdout, proc.stderr))
+    return proc.returncode, stdout, stderr
+
+
+def run_command_job(argv):
+    """Execute command and return its result fields (also the RQ job function)."""
     try:
-        commands[command_id]['status'] = 'running'
-        
-        # Simple parameter substitution
-        for key, value in params.items():
-            cmd = cmd.replace(f'{{{key}}}', str(value))
+        return_code, stdout, stderr = _run_capped(argv, timeout=ASYNC_TIMEOUT)
         
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=300)
-        
-        commands[command_id].update({
+        return {
             'status': 'completed',
-            'stdout': result.stdout,
-            'stderr': result.stderr,
-            'return_code': result.returncode
-        })
+            'stdout': stdout,
+            'stderr': stderr,
+            'return_code': return_code
+        }
     except subprocess.TimeoutExpired:
-        commands[command_id].update({'status': 'timeout', 'error': 'Command timed out'})
+        return {'status': 'timeout', 'error': 'Command timed out'}
     except Exception as e:
-        commands[command_id].update({'status': 'error', 'error': str(e)})
+        return {'status': 'error', 'error': str(e)}
+
+
+def run_command(command_id, argv):
+    """Execute command and store result, then free its queue slot."""
+    try:
+        _update_command(command_id, status='running')
+        result = run_command_job(argv)
+        with _lock:
+            entry = commands.get(command_id)
+            if entry is not None:
+                for name, value in result.items():
+                    setattr(entry, name, value)
+                entry.done.set()
+                _finished.append((time.monotonic(), command_id))
+    finally:
+        _slots.release()
+
+
+def _job_entry(job) -> dict:
+    """Convert an RQ job into the same shape as an in-memory command entry."""
+    job_status = job.get_status()
+    job_status = getattr(job_status, 'value', job_status)
+    entry = {'command': job.meta.get('command'), 'status': _RQ_STATUS.get(job_status, job_status)}
+    
+    if job_status == 'finished':
+        entry.update(job.result or {})
+    elif job_status == 'failed':
+        lines = (job.exc_info or '').strip().splitlines()
+        entry['error'] = lines[-1] if lines else 'Command failed'
+    return entry
 
 
 @commands_bp.route('/execute', methods=['POST'])
@@ -59,60 +296,226 @@ def execute():
     """
     Execute a command.
     
-    WARNING: This endpoint executes arbitrary shell commands.
+    WARNING: This endpoint executes arbitrary commands. The command string is
+    split shell-style but is not run through a shell, so pipes, redirects and
+    variable expansion are not available.
     Only use in trusted development environments.
     """
-    data = request.json
+    data = payload()
     cmd = data.get('command')
     params = data.get('params', {})
     async_exec = data.get('async', False)
     
     if not cmd:
-        return jsonify({'error': 'Command is required'}), 400
+        return _error_response(_ERR_CMD_REQUIRED)
+    if not isinstance(cmd, str):
+        return json_response({'error': "Invalid 'command': expected str"}, 400)
+    if not isinstance(params, dict):
+        return json_response({'error': "Invalid 'params': expected dict"}, 400)
+    
+    try:
+        argv = _materialize(cmd, params)
+    except ValueError as e:
+        return json_response({'error': f'Invalid command: {e}'}, 400)
+    
+    if not argv:
+        return _error_response(_ERR_CMD_REQUIRED)
     
     # Security check
-    if not _is_command_allowed(cmd):
-        return jsonify({'error': 'Command not in allowed whitelist'}), 403
+    if not _is_command_allowed(argv):
+        return _error_response(_ERR_NOT_ALLOWED)
     
     if async_exec:
         # Async execution
-        command_id = str(uuid.uuid4())
-        commands[command_id] = {'command': cmd, 'status': 'pending'}
+        command_id = _new_command_id()
+        if _queue is not None:
+            _queue.enqueue(
+                run_command_job, argv,
+                job_id=command_id,
+                job_timeout=ASYNC_TIMEOUT + 30,
+                result_ttl=COMMAND_TTL,
+                failure_ttl=COMMAND_TTL,
+                meta={'command': cmd}
+            )
+            return json_response({'command_id': command_id, 'status': 'pending'})
         
-        thread = threading.Thread(target=run_command, args=(command_id, cmd, params))
-        thread.daemon = True
-        thread.start()
+        if not _slots.acquire(blocking=False):
+            return _error_response(_ERR_BUSY, {'Retry-After': RETRY_AFTER})
         
-        return jsonify({'command_id': command_id, 'status': 'pending'})
+        with _lock:
+            commands[command_id] = CmdRecord(command=cmd)
+            _evict_commands()
+        
+        try:
+            _executor.submit(run_command, command_id, argv)
+        except RuntimeError:
+            # Executor shut down (interpreter exiting)
+            with _lock:
+                commands.pop(command_id, None)
+            _slots.release()
+            raise
+        
+        return json_response({'command_id': command_id, 'status': 'pending'})
     else:
         # Sync execution
         try:
-            for key, value in params.items():
-                cmd = cmd.replace(f'{{{key}}}', str(value))
+            return_code, stdout, stderr = _run_capped(argv, timeout=60)
             
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=60)
-            
-            return jsonify({
-                'stdout': result.stdout,
-                'stderr': result.stderr,
-                'return_code': result.returncode
+            return json_response({
+                'stdout': stdout,
+                'stderr': stderr,
+                'return_code': return_code
             })
         except subprocess.TimeoutExpired:
-            return jsonify({'error': 'Command timed out'}), 408
+            return _error_response(_ERR_TIMED_OUT)
         except Exception as e:
-            return jsonify({'error': str(e)}), 500
+            return json_response({'error': str(e)}, 500)
 
 
 @commands_bp.route('/status/<command_id>')
 def status(command_id):
-    """Get command status."""
-    if command_id not in commands:
-        return jsonify({'error': 'Command not found'}), 404
+    """
+    Get command status.
     
-    return jsonify(commands[command_id])
+    With ``?wait_ms=N`` (capped at MAX_WAIT_MS), the request blocks until
+    the command finishes or N milliseconds pass, so clients can long-poll
+    instead of re-requesting on a fixed interval.
+    """
+    wait = min(max(request.args.get('wait_ms', 0, type=int), 0), MAX_WAIT_MS) / 1000
+    
+    if _queue is not None:
+        try:
+            job = Job.fetch(command_id, connection=_queue.connection)
+        except NoSuchJobError:
+            return _error_response(_ERR_NOT_FOUND)
+        entry = _job_entry(job)
+        deadline = time.monotonic() + wait
+        while entry['status'] in ('pending', 'running') and time.monotonic() < deadline:
+            time.sleep(min(0.1, max(deadline - time.monotonic(), 0)))
+            job.refresh()
+            entry = _job_entry(job)
+        return json_response(entry)
+    
+    with _lock:
+        record = commands.get(command_id)
+    
+    if record is None:
+        return _error_response(_ERR_NOT_FOUND)
+    
+    if wait:
+        record.done.wait(wait)
+    
+    with _lock:
+        entry = record.to_dict()
+    
+    return json_response(entry)
+
+
+@commands_bp.route('/status')
+def status_batch():
+    """
+    Get the status of several commands in one request (``?ids=a,b,c``).
+    
+    Returns a mapping of command ID to its status entry, or null for
+    unknown IDs.
+    """
+    command_ids = [cid for cid in request.args.get('ids', '').split(',') if cid][:MAX_STATUS_IDS]
+    
+    if _queue is not None:
+        jobs = Job.fetch_many(command_ids, connection=_queue.connection)
+        return json_response({cid: _job_entry(job) if job is not None else None
+                              for cid, job in zip(command_ids, jobs)})
+    
+    # One lock acquisition for the whole batch
+    with _lock:
+        entries = {}
+        for cid in command_ids:
+            record = commands.get(cid)
+            entries[cid] = record.to_dict() if record is not None else None
+    
+    return json_response(entries)
+
+
+def _sse(event: str, data) -> bytes:
+    """Encode one Server-Sent Event."""
+    return b'event: ' + event.encode() + b'\ndata: ' + orjson.dumps(data) + b'\n\n'
+
+
+def _stream_entries(read_entry, wait):
+    """
+    Yield SSE frames for each status change until the command finishes.
+    
+    Args:
+        read_entry: Callable returning the current entry dict
+        wait: Callable(timeout) that blocks until the command may have changed
+    """
+    last_status = None
+    idle = 0.0
+    while True:
+        entry = read_entry()
+        finished = entry['status'] not in ('pending', 'running')
+        if finished:
+            yield _sse('completed', entry)
+            return
+        if entry['status'] != last_status:
+            last_status, idle = entry['status'], 0.0
+            yield _sse('status', entry)
+        elif idle >= STREAM_KEEPALIVE:
+            idle = 0.0
+            yield b': keep-alive\n\n'
+        idle += wait(1.0)
+
+
+@commands_bp.route('/stream/<command_id>')
+def stream(command_id):
+    """
+    Stream a command's status as Server-Sent Events.
+    
+    Emits a ``status`` event for each state change and a final
+    ``completed`` event carrying the full result, then closes.
+    """
+    if _queue is not None:
+        try:
+            job = Job.fetch(command_id, connection=_queue.connection)
+        except NoSuchJobError:
+            return _error_response(_ERR_NOT_FOUND)
+        
+        def read_entry():
+            job.refresh()
+            return _job_entry(job)
+        
+        def wait(timeout):
+            time.sleep(0.25)
+            return 0.25
+    else:
+        with _lock:
+            record = commands.get(command_id)
+        if record is None:
+            return _error_response(_ERR_NOT_FOUND)
+        
+        def read_entry():
+            with _lock:
+                return record.to_dict()
+        
+        def wait(timeout):
+            # Wakes immediately on completion; status changes before that are picked up each second
+            record.done.wait(timeout)
+            return timeout
+    
+    return Response(_stream_entries(read_entry, wait), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 
 @commands_bp.route('/list')
 def list_commands():
     """List all commands."""
-    return jsonify(list(commands.keys()))
+    if _queue is not None:
+        command_ids = _queue.get_job_ids()
+        for registry_cls in (StartedJobRegistry, FinishedJobRegistry, FailedJobRegistry):
+            command_ids.extend(registry_cls(queue=_queue).get_job_ids())
+        return json_response(command_ids)
+    
+    with _lock:
+        command_ids = list(commands.keys())
+    
+    return json_response(command_ids)
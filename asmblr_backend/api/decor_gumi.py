@@ -1,396 +1,392 @@
-"""Geolipi shader generation endpoints."""
+"""DecorGumi polyarc optimization and validation endpoints."""
 
-from flask import Blueprint, request, jsonify
-import traceback
+import atexit
+import importlib.util
 import io
-import geolipi.symbolic as gls
-import trimesh
-from decor_gumi.arc_opt import (optimize_polyarc, 
-                                default_curvature_bounded, minkowski_summed,
-                                violating_medial_points, curvature_issue_points,
-                                expr_to_api_polyarc)
-from decor_gumi.corner_rounding import default_curvature_bound_iterative
-from decor_gumi.validation import validate_joint as validate_joint_mesh
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import cache, wraps
+from types import SimpleNamespace
+from typing import Optional
+
+import orjson
+from flask import Blueprint, Response
+
+from asmblr_backend.utils import create_response, format_error, LRUCache, stable_hash, payload, submit
+
+# decor_gumi (and trimesh) are heavy, so they are imported on first use.
+# Fail at import time if they are missing so the blueprint stays optional;
+# submodules that fail to import later are reported per request as a 503.
+for _required in ('decor_gumi', 'trimesh'):
+    if importlib.util.find_spec(_required) is None:
+        raise ImportError(f"{_required} package is not installed")
+
+
+@cache
+def _decor_gumi():
+    """Import decor_gumi and trimesh once, on the first request that needs them."""
+    import trimesh
+    from decor_gumi.arc_opt import (optimize_polyarc, minkowski_summed,
+                                    violating_medial_points, curvature_issue_points,
+                                    expr_to_api_polyarc)
+    from decor_gumi.corner_rounding import default_curvature_bound_iterative
+    from decor_gumi.validation import validate_joint as validate_joint_mesh
+    
+    return SimpleNamespace(
+        trimesh=trimesh,
+        optimize_polyarc=optimize_polyarc,
+        minkowski_summed=minkowski_summed,
+        violating_medial_points=violating_medial_points,
+        curvature_issue_points=curvature_issue_points,
+        expr_to_api_polyarc=expr_to_api_polyarc,
+        default_curvature_bound_iterative=default_curvature_bound_iterative,
+        validate_joint_mesh=validate_joint_mesh,
+    )
+
+
+@cache
+def _decor_gumi_import_error() -> Optional[str]:
+    """Try the deferred imports once; return the error message if they fail."""
+    try:
+        _decor_gumi()
+    except ImportError as e:
+        log.error("DecorGumi modules failed to import: %s", e)
+        return str(e)
+    return None
 
 
 decorgumi_bp = Blueprint('decor_gumi', __name__, url_prefix='/api/decor_gumi')
+log = logging.getLogger(__name__)
+
+
+@decorgumi_bp.before_request
+def _require_decor_gumi():
+    """Answer 503 when decor_gumi is installed but its modules cannot be imported."""
+    error = _decor_gumi_import_error()
+    if error is not None:
+        return create_response(error=f"DecorGumi is unavailable: {error}", status_code=503)
+
+# Results of the heavy geometry calls, keyed by a hash of their inputs.
+# The UI frequently re-sends identical designs (e.g. sliders snapping back).
+CACHE_SIZE = int(os.getenv('ASMBLR_DECOR_CACHE_SIZE', '512'))
+_OPT_CACHE = LRUCache(CACHE_SIZE)
+_MINK_CACHE = LRUCache(CACHE_SIZE)
+_CURV_BOUND_CACHE = LRUCache(CACHE_SIZE)
+_MEDIAL_CACHE = LRUCache(CACHE_SIZE)
+_CURV_ISSUE_CACHE = LRUCache(CACHE_SIZE)
+
+
+# Worker pool for independent work within a single request (validate-design checks,
+# validate-joint mesh loads)
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='decor-gumi')
+atexit.register(_executor.shutdown, wait=False)
+
+
+def _memoized(cache, fn, *args):
+    """
+    Call fn(*args) through cache, keyed by a stable hash of the arguments.
+    
+    Misses are computed in the shared process pool; fn and its arguments
+    must be picklable (module-level functions and JSON data).
+    """
+    return cache.get_or_compute(
+        stable_hash(fn.__name__, *args),
+        lambda: submit(fn, *args).result()
+    )
 
-def create_response(content=None, messages=None, error=None, status_code=200):
+
+def _optimize_to_api_polyarc(input_polyarc, two_sided, dilation_rate, mixed_opt):
+    """Optimize a polyarc and convert the result to the API polyarc format."""
+    dg = _decor_gumi()
+    expr_out = dg.optimize_polyarc(input_polyarc, two_sided, dilation_rate, mixed_opt)
+    return dg.expr_to_api_polyarc(expr_out)
+
+
+# Missing-polyarc error in the standard envelope, encoded once
+_NO_POLYARC_BODY = orjson.dumps({"content": None, "messages": [], "error": "No input polyarc provided"})
+
+
+def _no_polyarc_response():
+    """Return the standard 400 response for payloads without a polyarc."""
+    return Response(_NO_POLYARC_BODY, status=400, mimetype='application/json')
+
+
+# Accepted JSON types for each default's type (JSON integers are valid floats)
+_PARAM_TYPES = {bool: (bool,), float: (int, float)}
+
+
+def _read_params(data, params, fixed=None):
     """
-    Create standardized API response with content, messages, and error handling.
+    Read request params in order, checking each against its default's type.
+    
+    Bad values are rejected here, before any geometry work is queued,
+    instead of failing inside the worker.
     
     Args:
-        content: The main response data (dict or any serializable type)
-        messages: List of informational messages to show as notifications
-        error: Error information (string or dict with message and traceback)
-        status_code: HTTP status code
+        data: Request payload
+        params: Tuple of (key, default) pairs
+        fixed: Optional dict of values that override the request
     
     Returns:
-        Flask response with standardized format
+        tuple: (list of values, error message or None)
     """
-    response_data = {
-        "content": content,
-        "messages": messages or [],
-        "error": error
-    }
-    
-    return jsonify(response_data), status_code
+    fixed = fixed or {}
+    values = []
+    for key, default in params:
+        if key in fixed:
+            values.append(fixed[key])
+            continue
+        value = data.get(key, default)
+        expected = type(default)
+        # bool is an int subclass, so only accept it where a bool is expected
+        if not isinstance(value, _PARAM_TYPES.get(expected, (expected,))) or (
+                isinstance(value, bool) and expected is not bool):
+            return None, f"Invalid '{key}': expected {expected.__name__}"
+        values.append(value)
+    return values, None
 
-@decorgumi_bp.route('/update-design', methods=['POST'])
-def update_design():
-    """Update the design with the given input."""
-    try:
-        # Extract the payload from the request
-        messages = []
-        data = request.json or {}
-        two_sided = data.get('two_sided', True)
-        dilation_rate = data.get('dilation_rate', 0.105)
-        mixed_opt = data.get('mixed_opt', False)
-        if 'polyarc' in data:
-            input_polyarc = data['polyarc']
-            # Create HTML visualization
-            # output_polyarc = optimize_polyarc(input_polyarc, two_sided, dilation_rate, mixed_opt)
-            expr_out = optimize_polyarc(input_polyarc, two_sided, dilation_rate, mixed_opt)
-            output_polyarc = expr_to_api_polyarc(expr_out)
-        else:
+
+def _polyarc_endpoint(fn):
+    """Wrap an endpoint so uncaught exceptions become a standardized 500 response."""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            log.exception("Error in %s: %s", fn.__name__, e)
             return create_response(
-                error="No input polyarc provided",
-                status_code=400
+                error=format_error(e),
+                status_code=500
             )
-        return create_response(
-            content={"polyarc": output_polyarc},
-            messages=messages
-        )
-    
-    except Exception as e:
-        error_info = {
-            "message": str(e),
-            "traceback": traceback.format_exc(),
-            "type": type(e).__name__
-        }
-        print(f"Error in generate_shader: {e}")
-        print(traceback.format_exc())
-        return create_response(
-            error=error_info,
-            status_code=500
-        )
+    return wrapper
 
 
+# Single-call polyarc endpoints, served by one shared view.
+#   rule: (endpoint, docstring, cache, function getter, request params with defaults,
+#          fixed params, output key)
+# Params are passed positionally after the polyarc, in the listed order; fixed params
+# override the request value.
+_POLYARC_ENDPOINTS = {
+    '/update-design': (
+        'update_design', "Update the design with the given input.",
+        _OPT_CACHE, lambda: _optimize_to_api_polyarc,
+        (('two_sided', True), ('dilation_rate', 0.105), ('mixed_opt', False)), {}, 'polyarc'),
+    '/get-morphological-opening': (
+        'get_morphological_opening', "Get the morphological opening of the polyarc.",
+        _MINK_CACHE, lambda: _decor_gumi().minkowski_summed,
+        (('dilation_rate', 0.105),), {}, 'polyarc'),
+    '/get-initial-curvature-bounded': (
+        'get_initial_curvature_bounded', "Get the default curvature-bounded polyarc.",
+        _CURV_BOUND_CACHE, lambda: _decor_gumi().default_curvature_bound_iterative,
+        (('two_sided', True), ('dilation_rate', 0.105)), {}, 'polyarc'),
+    '/get-medial-issue-points': (
+        'get_medial_issue_points', "Get the medial issue points of the polyarc.",
+        _MEDIAL_CACHE, lambda: _decor_gumi().violating_medial_points,
+        (('two_sided', True), ('dilation_rate', 0.105)), {'dilation_rate': 0.25}, 'points'),
+    '/get-curvature_issue-points': (
+        'get_curvature_issue_points', "Get the curvature issue points of the polyarc.",
+        _CURV_ISSUE_CACHE, lambda: _decor_gumi().curvature_issue_points,
+        (('two_sided', True), ('dilation_rate', 0.105)), {'dilation_rate': 0.25}, 'points'),
+}
 
-@decorgumi_bp.route('/get-morphological-opening', methods=['POST'])
-def get_morphological_opening():
-    """Get the morphological opening from the database."""
-    try:
-        # Extract the payload from the request
-        messages = []
-        data = request.json or {}
-        if 'polyarc' in data:
-            input_polyarc = data['polyarc']
-            dilation_rate = data.get('dilation_rate', 0.105)
-            # Create HTML visualization
-            output_polyarc = minkowski_summed(input_polyarc, dilation_rate)
-        else:
-            return create_response(
-                error="No input polyarc provided",
-                status_code=400
-            )
-        return create_response(
-            content={"polyarc": output_polyarc},
-            messages=messages
-        )
-    
-    except Exception as e:
-        error_info = {
-            "message": str(e),
-            "traceback": traceback.format_exc(),
-            "type": type(e).__name__
-        }
-        print(f"Error in generate_shader: {e}")
-        print(traceback.format_exc())
-        return create_response(
-            error=error_info,
-            status_code=500
-        )
 
-@decorgumi_bp.route('/get-initial-curvature-bounded', methods=['POST'])
-def get_initial_curvature_bounded():
-    """Get the default curvature bounded from the database."""
-    try:
-        # Extract the payload from the request
-        messages = []
-        data = request.json or {}
-        if 'polyarc' in data:
-            input_polyarc = data['polyarc']
-            two_sided = data.get('two_sided', True)
-            dilation_rate = data.get('dilation_rate', 0.105)
-            # Create HTML visualization
-            output_polyarc = default_curvature_bound_iterative(input_polyarc, two_sided, dilation_rate)
-        else:
-            return create_response(
-                error="No input polyarc provided",
-                status_code=400
-            )
+def _make_polyarc_view(endpoint, doc, cache, get_fn, params, fixed, output_key):
+    """Build the view function for a single-call polyarc endpoint."""
+    def view():
+        data = payload()
+        if 'polyarc' not in data:
+            return _no_polyarc_response()
+        
+        args, error = _read_params(data, params, fixed)
+        if error:
+            return create_response(error=error, status_code=400)
+        
+        output = _memoized(cache, get_fn(), data['polyarc'], *args)
         return create_response(
-            content={"polyarc": output_polyarc},
-            messages=messages
+            content={output_key: output},
+            messages=[]
         )
     
-    except Exception as e:
-        error_info = {
-            "message": str(e),
-            "traceback": traceback.format_exc(),
-            "type": type(e).__name__
-        }
-        print(f"Error in generate_shader: {e}")
-        print(traceback.format_exc())
-        return create_response(
-            error=error_info,
-            status_code=500
-        )
+    view.__name__ = endpoint
+    view.__doc__ = doc
+    return view
+
+
+for _rule, _spec in _POLYARC_ENDPOINTS.items():
+    decorgumi_bp.add_url_rule(_rule, endpoint=_spec[0], view_func=_polyarc_endpoint(_make_polyarc_view(*_spec)),
+                              methods=['POST'])
+
 
 @decorgumi_bp.route('/validate-design', methods=['POST'])
+@_polyarc_endpoint
 def validate_design():
     """Validate the design with the given input."""
-    try:
-        # Extract the payload from the request
-        validation_messages = []
-        valid_joint = True
-        data = request.json or {}
-        
-        if 'polyarc' not in data:
-            return create_response(
-                error="No input polyarc provided",
-                status_code=400
-            )
-        
-        input_polyarc = data['polyarc']
-        two_sided = data.get('two_sided', True)
-        dilation_rate = data.get('dilation_rate', 0.105)
-        
-        # Check for medial axis issues (shape too narrow for mill bit)
-        medial_issues = violating_medial_points(input_polyarc, two_sided, dilation_rate)
-        if medial_issues and len(medial_issues) > 0:
-            valid_joint = False
-            validation_messages.append(f"Shape has {len(medial_issues)} region(s) too narrow for mill bit")
-        
-        # Check for curvature issues (corners too sharp for mill bit)
-        curvature_issues = curvature_issue_points(input_polyarc, two_sided, dilation_rate)
-        if curvature_issues and len(curvature_issues) > 0:
-            valid_joint = False
-            validation_messages.append(f"Shape has {len(curvature_issues)} region(s) with curvature too sharp for mill bit")
-        
-        return create_response(
-            content={
-                "valid_joint": valid_joint,
-                "validation_messages": validation_messages
-            }
-        )
+    # Extract the payload from the request
+    validation_messages = []
+    valid_joint = True
+    data = payload()
     
-    except Exception as e:
-        error_info = {
-            "message": str(e),
-            "traceback": traceback.format_exc(),
-            "type": type(e).__name__
+    if 'polyarc' not in data:
+        return _no_polyarc_response()
+    
+    input_polyarc = data['polyarc']
+    args, error = _read_params(data, (('two_sided', True), ('dilation_rate', 0.105)))
+    if error:
+        return create_response(error=error, status_code=400)
+    two_sided, dilation_rate = args
+    
+    # The two checks are independent, so run them concurrently
+    medial_future = _executor.submit(_memoized, _MEDIAL_CACHE, _decor_gumi().violating_medial_points,
+                                     input_polyarc, two_sided, dilation_rate)
+    curvature_future = _executor.submit(_memoized, _CURV_ISSUE_CACHE, _decor_gumi().curvature_issue_points,
+                                        input_polyarc, two_sided, dilation_rate)
+    
+    # Check for medial axis issues (shape too narrow for mill bit)
+    medial_issues = medial_future.result()
+    if medial_issues:
+        valid_joint = False
+        validation_messages.append(f"Shape has {len(medial_issues)} region(s) too narrow for mill bit")
+    
+    # Check for curvature issues (corners too sharp for mill bit)
+    curvature_issues = curvature_future.result()
+    if curvature_issues:
+        valid_joint = False
+        validation_messages.append(f"Shape has {len(curvature_issues)} region(s) with curvature too sharp for mill bit")
+    
+    return create_response(
+        content={
+            "valid_joint": valid_joint,
+            "validation_messages": validation_messages
         }
-        print(f"Error in validate_design: {e}")
-        print(traceback.format_exc())
-        return create_response(
-            error=error_info,
-            status_code=500
-        ) 
+    )
 
 
-@decorgumi_bp.route('/get-medial-issue-points', methods=['POST'])
-def get_medial_issue_points():
-    """Get the medial issue points from the database."""
-    try:
-        # Extract the payload from the request
-        messages = []
-        data = request.json or {}
-        if 'polyarc' in data:
-            input_polyarc = data['polyarc']
-            two_sided = data.get('two_sided', True)
-            dilation_rate = 0.25 # data.get('dilation_rate', 0.105)
-            # Create HTML visualization
-            output_points = violating_medial_points(input_polyarc, two_sided, dilation_rate)
-        else:
-            return create_response(
-                error="No input polyarc provided",
-                status_code=400
-            )
-        return create_response(
-            content={"points": output_points},
-            messages=messages
-        )
+@dataclass(slots=True)
+class JointValidation:
+    """Joint validation messages with their failure flags precomputed."""
+    has_gaps: bool
+    has_intersections: bool
+    messages: list
     
-    except Exception as e:
-        error_info = {
-            "message": str(e),
-            "traceback": traceback.format_exc(),
-            "type": type(e).__name__
-        }
-        print(f"Error in generate_shader: {e}")
-        print(traceback.format_exc())
-        return create_response(
-            error=error_info,
-            status_code=500
+    @property
+    def valid(self) -> bool:
+        return not (self.has_gaps or self.has_intersections)
+    
+    @classmethod
+    def from_messages(cls, messages) -> "JointValidation":
+        """Classify validate_joint_mesh messages in a single pass over their text."""
+        messages = list(messages)
+        text = "\n".join(messages)
+        return cls(
+            has_gaps="Has gaps" in text,
+            has_intersections="Has intersections" in text,
+            messages=messages
         )
 
 
-@decorgumi_bp.route('/get-curvature_issue-points', methods=['POST'])
-def get_curvature_issue_points():
-    """Get the curvature issue points from the database."""
-
-    try:
-        # Extract the payload from the request
-        messages = []
-        data = request.json or {}
-        if 'polyarc' in data:
-            input_polyarc = data['polyarc']
-            two_sided = data.get('two_sided', True)
-            dilation_rate = 0.25 # data.get('dilation_rate', 0.105)
-            # Create HTML visualization
-            output_points = curvature_issue_points(input_polyarc, two_sided, dilation_rate)
+def _load_mesh_from_string(obj_content: str):
+    """Load a trimesh.Trimesh from OBJ content string."""
+    trimesh = _decor_gumi().trimesh
+    
+    # isspace() scans in place; strip() would copy a potentially multi-MB string
+    if not isinstance(obj_content, str) or not obj_content or obj_content.isspace():
+        raise ValueError("OBJ content is empty")
+    
+    # Create a file-like object from the string
+    obj_file = io.StringIO(obj_content)
+    mesh = trimesh.load(obj_file, file_type='obj', process=False)
+    
+    # Handle Scene objects
+    if isinstance(mesh, trimesh.Scene):
+        meshes = [geom for geom in mesh.geometry.values() if isinstance(geom, trimesh.Trimesh)]
+        if not meshes:
+            raise ValueError("No valid meshes found in OBJ content")
+        elif len(meshes) == 1:
+            mesh = meshes[0]
         else:
-            return create_response(
-                error="No input polyarc provided",
-                status_code=400
-            )
-        return create_response(
-            content={"points": output_points},
-            messages=messages
-        )
+            # Union all meshes in the scene
+            mesh = trimesh.util.concatenate(meshes)
     
-    except Exception as e:
-        error_info = {
-            "message": str(e),
-            "traceback": traceback.format_exc(),
-            "type": type(e).__name__
-        }
-        print(f"Error in generate_shader: {e}")
-        print(traceback.format_exc())
-        return create_response(
-            error=error_info,
-            status_code=500
-        )
+    if not isinstance(mesh, trimesh.Trimesh):
+        raise ValueError(f"Failed to load mesh from OBJ content. Got type: {type(mesh)}")
+    
+    # Clean up the mesh. Validation only needs positions: merge on them alone rather
+    # than also keying on OBJ normals/UVs (fix_normals recomputes winding anyway)
+    mesh.merge_vertices(merge_tex=True, merge_norm=True)
+    mesh.fix_normals()
+    
+    return mesh
 
 
 @decorgumi_bp.route('/validate-joint', methods=['POST'])
+@_polyarc_endpoint
 def validate_joint():
     """Validate a joint from mesh data and assembly information."""
+    data = payload()
+    
+    # Required: mesh data and info dict
+    required_keys = ['p_a_obj', 'p_b_obj', 'j_a_obj', 'j_b_obj', 'info']
+    missing_keys = [key for key in required_keys if key not in data]
+    if missing_keys:
+        return create_response(
+            error=f"Missing required keys: {', '.join(missing_keys)}",
+            status_code=400
+        )
+    
+    p_a_obj = data['p_a_obj']
+    p_b_obj = data['p_b_obj']
+    j_a_obj = data['j_a_obj']
+    j_b_obj = data['j_b_obj']
+    info = data['info']
+    
+    # Optional parameters
+    num_samples = data.get('num_samples', 10)
+    ratio = data.get('ratio', 1.0)
+    
+    log.debug("Loading meshes from OBJ content")
+    
+    # Load all meshes concurrently
     try:
-        data = request.json or {}
-        
-        # Required: mesh data and info dict
-        required_keys = ['p_a_obj', 'p_b_obj', 'j_a_obj', 'j_b_obj', 'info']
-        missing_keys = [key for key in required_keys if key not in data]
-        if missing_keys:
-            return create_response(
-                error=f"Missing required keys: {', '.join(missing_keys)}",
-                status_code=400
-            )
-        
-        p_a_obj = data['p_a_obj']
-        p_b_obj = data['p_b_obj']
-        j_a_obj = data['j_a_obj']
-        j_b_obj = data['j_b_obj']
-        info = data['info']
-        
-        # Optional parameters
-        num_samples = data.get('num_samples', 10)
-        ratio = data.get('ratio', 1.0)
-        
-        print(f"[validate_joint] Loading meshes from OBJ content")
-        
-        # Load meshes from OBJ content strings
-        def load_mesh_from_string(obj_content: str) -> trimesh.Trimesh:
-            """Load a mesh from OBJ content string."""
-            if not obj_content.strip():
-                raise ValueError("OBJ content is empty")
-            
-            # Create a file-like object from the string
-            obj_file = io.StringIO(obj_content)
-            mesh = trimesh.load(obj_file, file_type='obj', process=False)
-            
-            # Handle Scene objects
-            if isinstance(mesh, trimesh.Scene):
-                meshes = [geom for geom in mesh.geometry.values() if isinstance(geom, trimesh.Trimesh)]
-                if not meshes:
-                    raise ValueError("No valid meshes found in OBJ content")
-                elif len(meshes) == 1:
-                    mesh = meshes[0]
-                else:
-                    # Union all meshes in the scene
-                    mesh = trimesh.util.concatenate(meshes)
-            
-            if not isinstance(mesh, trimesh.Trimesh):
-                raise ValueError(f"Failed to load mesh from OBJ content. Got type: {type(mesh)}")
-            
-            # Clean up the mesh
-            mesh.merge_vertices()
-            mesh.fix_normals()
-            
-            return mesh
-        
-        # Load all meshes
-        try:
-            p_a_mesh = load_mesh_from_string(p_a_obj)
-            p_b_mesh = load_mesh_from_string(p_b_obj)
-            j_a_mesh = load_mesh_from_string(j_a_obj)
-            j_b_mesh = load_mesh_from_string(j_b_obj)
-        except Exception as e:
-            return create_response(
-                error=f"Failed to load meshes: {str(e)}",
-                status_code=400
-            )
-        
-        print(f"[validate_joint] Meshes loaded successfully")
-        print(f"[validate_joint] Part A: {len(p_a_mesh.vertices)} vertices, {len(p_a_mesh.faces)} faces")
-        print(f"[validate_joint] Part B: {len(p_b_mesh.vertices)} vertices, {len(p_b_mesh.faces)} faces")
-        print(f"[validate_joint] Joint A: {len(j_a_mesh.vertices)} vertices, {len(j_a_mesh.faces)} faces")
-        print(f"[validate_joint] Joint B: {len(j_b_mesh.vertices)} vertices, {len(j_b_mesh.faces)} faces")
-        
-        # Validate joint using the validation function
-        try:
-            validation_messages = validate_joint_mesh(
-                p_a_mesh=p_a_mesh,
-                p_b_mesh=p_b_mesh,
-                j_a_mesh=j_a_mesh,
-                j_b_mesh=j_b_mesh,
-                info=info,
-                num_samples=num_samples,
-                ratio=ratio
-            )
-        except Exception as e:
-            return create_response(
-                error=f"Validation failed: {str(e)}",
-                status_code=400
-            )
-        
-        # Determine if joint is valid (no gaps, no intersections)
-        valid_joint = True
-        for msg in validation_messages:
-            if "Has gaps" in msg or "Has intersections" in msg:
-                valid_joint = False
-                break
-        
+        p_a_mesh, p_b_mesh, j_a_mesh, j_b_mesh = _executor.map(
+            _load_mesh_from_string, [p_a_obj, p_b_obj, j_a_obj, j_b_obj]
+        )
+    except Exception as e:
         return create_response(
-            content={
-                "valid_joint": valid_joint,
-                "validation_messages": validation_messages
-            },
-            messages=[f"Validated joint assembly"]
+            error=f"Failed to load meshes: {str(e)}",
+            status_code=400
         )
     
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Meshes loaded successfully")
+        for label, mesh in (("Part A", p_a_mesh), ("Part B", p_b_mesh),
+                            ("Joint A", j_a_mesh), ("Joint B", j_b_mesh)):
+            log.debug("%s: %d vertices, %d faces", label, len(mesh.vertices), len(mesh.faces))
+    
+    # Validate joint using the validation function
+    try:
+        result = JointValidation.from_messages(submit(
+            _decor_gumi().validate_joint_mesh,
+            p_a_mesh=p_a_mesh,
+            p_b_mesh=p_b_mesh,
+            j_a_mesh=j_a_mesh,
+            j_b_mesh=j_b_mesh,
+            info=info,
+            num_samples=num_samples,
+            ratio=ratio
+        ).result())
     except Exception as e:
-        error_info = {
-            "message": str(e),
-            "traceback": traceback.format_exc(),
-            "type": type(e).__name__
-        }
-        print(f"Error in validate_joint: {e}")
-        print(traceback.format_exc())
         return create_response(
-            error=error_info,
-            status_code=500
-        )
\ No newline at end of file
+            error=f"Validation failed: {str(e)}",
+            status_code=400
+        )
+    
+    # A joint is valid when it has no gaps and no intersections
+    return create_response(
+        content={
+            "valid_joint": result.valid,
+            "validation_messages": result.messages
+        },
+        messages=[f"Validated joint assembly"]
+    )
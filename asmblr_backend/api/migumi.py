@@ -1,7 +1,12 @@
 """Migumi animation/state shader generation endpoints."""
 
-from flask import Blueprint, request
-import traceback
+import atexit
+import copy
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from flask import Blueprint
 import geolipi.symbolic as gls
 from sysl.utils import recursive_gls_to_sysl
 import sysl.symbolic as sls
@@ -11,14 +16,43 @@ from sysl.shader.evaluate import evaluate_to_shader
 import migumi.shader
 from sysl.shader import DEFAULT_SETTINGS
 from sysl.shader_runtime.generate_shader_html import create_shader_html, create_multibuffer_shader_html
-from migumi.utils.converter import fix_format, get_expr_and_state, fix_expr_dict
+from migumi.utils.converter import fix_format, fix_expr_dict
 from migumi.shader.compiler import compile_set
 from migumi.shader.compile_multipass import compile_set_multipass
 from sysl.shader.shader_templates.common import RenderMode
 
-from asmblr_backend.utils import create_response
+from asmblr_backend.utils import create_response, html_response, html_envelope_response, format_error, LRUCache, disk_cache, stable_hash, payload, prefers_html, extract_module_graph, twgl_content
 
 migumi_bp = Blueprint('migumi', __name__, url_prefix='/api/migumi')
+log = logging.getLogger(__name__)
+
+# Compiled shader bundles, keyed by a hash of the graph and settings that produced them
+_SHADER_CACHE = LRUCache(int(os.getenv('ASMBLR_SHADER_CACHE_SIZE', '128')), backing=disk_cache('migumi_shaders'))
+
+# Batch requests: graphs per request, and the workers that render them
+MAX_BATCH = int(os.getenv('ASMBLR_MAX_BATCH', '32'))
+_executor = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1), thread_name_prefix='migumi')
+atexit.register(_executor.shutdown, wait=False)
+
+
+def _add_geometry(node, expr_dict, state_map):
+    outputs = node.evaluate(None)
+    expr_dict[outputs['name']] = (outputs['expr'], outputs['bbox'])
+
+
+def _add_state(node, expr_dict, state_map):
+    outputs = node.evaluate(None)
+    state_map[outputs['state']] = outputs['expr']
+
+
+@cache
+def _node_handler(node_type):
+    """Resolve the handler for a node type once; later nodes of that type are a dict lookup."""
+    if issubclass(node_type, anodes.RegisterGeometry):
+        return _add_geometry
+    if issubclass(node_type, anodes.RegisterState):
+        return _add_state
+    return None
 
 
 def get_expr_and_state(nodes):
@@ -34,21 +68,14 @@ def get_expr_and_state(nodes):
     expr_dict = {}
     state_map = {}
     for node in nodes:
-        if isinstance(node, anodes.RegisterGeometry):
-            outputs = node.evaluate(None)
-            expr = outputs['expr']
-            bbox = outputs['bbox']
-            expr_name = outputs['name']
-            expr_dict[expr_name] = (expr, bbox)
-        elif isinstance(node, anodes.RegisterState):
-            outputs = node.evaluate(None)
-            expr = outputs['expr']
-            state = outputs['state']
-            state_map[state] = expr
+        handler = _node_handler(type(node))
+        if handler is not None:
+            handler(node, expr_dict, state_map)
     
-    # Sort by keys
-    state_sequence = sorted(state_map.keys())
-    state_map = {state: state_map[state] for state in state_sequence}
+    # Sort by keys; states usually arrive in order, so skip the rebuild when they do
+    states = list(state_map)
+    if any(a > b for a, b in zip(states, states[1:])):
+        state_map = {state: state_map[state] for state in sorted(states)}
     return expr_dict, state_map
 
 
@@ -62,40 +89,40 @@ def data_to_shader(data):
     Returns:
         tuple: (all_shader_bundles, messages)
     """
-    messages = []
-    
     # Extract and validate modules
-    modules = data.get("modules", {})
-    settings = data.get("shaderSettings", {})
+    module_data, verbose, messages = extract_module_graph(data, 'migumi', "migumi")
+    
+    settings = dict(data.get("shaderSettings", {}))  # local copy; popped below
     post_process_shader = settings.pop("post_process_shader", ["part_outline_nobg"])
     render_mode = settings.get("render_mode", RenderMode.DEFAULT)
-
-    if not modules or 'moduleList' not in modules or 'migumi' not in modules['moduleList']:
-        raise ValueError("Missing or invalid migumi module data in payload")
     
-    verbose = data.get('verbose', False)
-    module_data = modules['moduleList']['migumi']
-    if verbose:
-        messages.append(f"Processing migumi graph with {len(module_data.get('nodes', []))} nodes")
-    
-    corrected_data = fix_format(module_data)
-    node_expressions = BaseNode.from_dict(corrected_data)
+    # Identical graphs with identical settings compile to identical bundles
+    cache_key = stable_hash(module_data, data.get("shaderSettings", {}))
+    cached_bundles = _SHADER_CACHE.get(cache_key)
+    if cached_bundles is not None:
+        all_shader_bundles = copy.deepcopy(cached_bundles)
+        if verbose:
+            messages.append("Using cached shader bundles")
+    else:
+        corrected_data = fix_format(module_data)
+        node_expressions = BaseNode.from_dict(corrected_data)
 
-    if verbose:
-        messages.append("Node graph evaluation completed successfully")
-
-    # Generate shader code
-    if not isinstance(node_expressions, list):
-        node_expressions = [node_expressions]
-    expr_dict, state_map = get_expr_and_state(node_expressions)
-    expr_dict = fix_expr_dict(expr_dict, mode=render_mode, add_bounding=False)
-
-    all_shader_bundles = compile_set_multipass(
-        expr_dict, 
-        state_map, 
-        settings=settings,
-        post_process_shader=post_process_shader
-    )
+        if verbose:
+            messages.append("Node graph evaluation completed successfully")
+
+        # Generate shader code
+        if not isinstance(node_expressions, list):
+            node_expressions = [node_expressions]
+        expr_dict, state_map = get_expr_and_state(node_expressions)
+        expr_dict = fix_expr_dict(expr_dict, mode=render_mode, add_bounding=False)
+
+        all_shader_bundles = compile_set_multipass(
+            expr_dict, 
+            state_map, 
+            settings=settings,
+            post_process_shader=post_process_shader
+        )
+        _SHADER_CACHE.set(cache_key, copy.deepcopy(all_shader_bundles))
     
     if verbose:
         messages.append(f"Total {len(all_shader_bundles)} shader bundles generated")
@@ -107,38 +134,103 @@ def data_to_shader(data):
     return all_shader_bundles, messages
 
 
+def warmup():
+    """
+    Compile a tiny expression so first-call initialization in the shader
+    compiler (templates, snippet parsing) happens off the request path.
+    
+    Failures are logged and ignored; the first real request then pays the cost.
+    """
+    try:
+        expr_dict = fix_expr_dict({"__warmup__": (gls.Sphere(0.5), None)},
+                                  mode=RenderMode.DEFAULT, add_bounding=False)
+        compile_set_multipass(expr_dict, {}, settings={}, post_process_shader=[])
+        log.debug("Shader compiler warm-up completed")
+    except Exception as e:
+        log.warning("Shader compiler warm-up failed: %s", e)
+
+
+def _shader_html(data):
+    """
+    Compile a migumi graph and build its HTML visualization.
+    
+    Args:
+        data: Request payload containing modules and settings
+    
+    Returns:
+        tuple: (html_code, messages)
+    """
+    all_shader_bundles, messages = data_to_shader(data)
+    
+    # Create HTML visualization
+    html_code = create_multibuffer_shader_html(
+        all_shader_bundles, 
+        show_controls=True, 
+        backend="twgl",
+        layout_horizontal=True
+    )
+    return html_code, messages
+
+
 @migumi_bp.route('/generate-shader', methods=['POST'])
 def generate_shader():
     """Generate shader code with HTML visualization."""
     try:
-        data = request.json or {}
-        all_shader_bundles, messages = data_to_shader(data)
+        html_code, messages = _shader_html(payload())
         
-        # Create HTML visualization
-        html_code = create_multibuffer_shader_html(
-            all_shader_bundles, 
-            show_controls=True, 
-            backend="twgl",
-            layout_horizontal=True
-        )
+        # Clients that render the page directly get it as-is, without the JSON envelope
+        if prefers_html():
+            return html_response(html_code)
         
         messages.append("HTML visualization generated successfully")
 
+        return html_envelope_response(html_code, messages)
+    
+    except Exception as e:
+        log.exception("Error in generate_shader: %s", e)
+        return create_response(
+            error=format_error(e),
+            status_code=500
+        )
+
+
+def _batch_item(data):
+    """Render one batch entry, returning (content, error) instead of raising."""
+    try:
+        if not isinstance(data, dict):
+            raise ValueError("Batch entries must be JSON objects")
+        html_code, messages = _shader_html(data)
+        return {"html": html_code, "messages": messages}, None
+    except Exception as e:
+        log.exception("Error in generate_shader_batch: %s", e)
+        return None, format_error(e)
+
+
+@migumi_bp.route('/generate-shader-batch', methods=['POST'])
+def generate_shader_batch():
+    """Generate HTML visualizations for several graphs in one request."""
+    try:
+        batch = payload().get('requests')
+        if not isinstance(batch, list) or not batch:
+            return create_response(error="No requests provided", status_code=400)
+        if len(batch) > MAX_BATCH:
+            return create_response(error=f"Too many requests in batch (max {MAX_BATCH})", status_code=400)
+        
+        # Entries are independent and share the bundle cache with single-graph requests
+        outcomes = list(_executor.map(_batch_item, batch))
+        results = [content for content, _ in outcomes]
+        errors = [error for _, error in outcomes]
+        succeeded = sum(content is not None for content in results)
+        
         return create_response(
-            content={"html": html_code},
-            messages=messages
+            content={"results": results, "errors": errors},
+            messages=[f"Generated {succeeded} of {len(batch)} shaders"]
         )
     
     except Exception as e:
-        error_info = {
-            "message": str(e),
-            "traceback": traceback.format_exc(),
-            "type": type(e).__name__
-        }
-        print(f"Error in generate_shader: {e}")
-        print(traceback.format_exc())
+        log.exception("Error in generate_shader_batch: %s", e)
         return create_response(
-            error=error_info,
+            error=format_error(e),
             status_code=500
         )
 
@@ -147,39 +239,22 @@ def generate_shader():
 def generate_twgl_shader():
     """Generate TWGL-compatible shader code with configurable settings."""
     try:
-        print("Generating TWGL shader")
-        data = request.json or {}
+        data = payload()
         all_shader_bundles, messages = data_to_shader(data)
         
         # Extract shader components from bundles
-        if isinstance(all_shader_bundles, tuple):
-            shader_code, uniforms, textures = all_shader_bundles
-        else:
-            shader_bundle = all_shader_bundles[0] if isinstance(all_shader_bundles, list) else all_shader_bundles
-            shader_code = shader_bundle.get('shader_code', '')
-            uniforms = shader_bundle.get('uniforms', {})
-            textures = shader_bundle.get('textures', {})
+        content = twgl_content(all_shader_bundles)
         
         messages.append("TWGL shader code generated successfully")
         
         return create_response(
-            content={
-                "shaderCode": shader_code,
-                "uniforms": uniforms,
-                "textures": textures,
-            },
+            content=content,
             messages=messages
         )
     
     except Exception as e:
-        error_info = {
-            "message": str(e),
-            "traceback": traceback.format_exc(),
-            "type": type(e).__name__
-        }
-        print(f"Error in generate_twgl_shader: {e}")
-        print(traceback.format_exc())
+        log.exception("Error in generate_twgl_shader: %s", e)
         return create_response(
-            error=error_info,
+            error=format_error(e),
             status_code=500
         )
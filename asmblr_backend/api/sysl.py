@@ -1,42 +1,45 @@
 """SYSL shader generation endpoints."""
 
-from flask import Blueprint, request
-import traceback
+import copy
+import logging
+import os
+from flask import Blueprint
 import sysl.symbolic as ssls
 from asmblr.base import BaseNode
 from sysl.shader.evaluate import evaluate_to_shader
 from sysl.shader import DEFAULT_SETTINGS
 from sysl.shader_runtime.generate_shader_html import create_shader_html, create_multibuffer_shader_html
 
-from asmblr_backend.utils import create_response
+from asmblr_backend.utils import create_response, html_response, html_envelope_response, format_error, LRUCache, disk_cache, stable_hash, payload, prefers_html, extract_module_graph, twgl_content
 
 sysl_bp = Blueprint('sysl', __name__, url_prefix='/api/sysl')
+log = logging.getLogger(__name__)
 
+# Compiled shader bundles, keyed by a hash of the graph and settings that produced them
+_SHADER_CACHE = LRUCache(int(os.getenv('ASMBLR_SHADER_CACHE_SIZE', '128')), backing=disk_cache('sysl_shaders'))
+# Evaluated graph expressions, keyed by a hash of the graph alone, so settings-only changes skip evaluation
+_GRAPH_CACHE = LRUCache(int(os.getenv('ASMBLR_GRAPH_CACHE_SIZE', '256')))
 
-def data_to_shader(data, shader_mode="singlepass"):
+
+def _evaluate_graph(expr_dict, verbose, messages):
     """
-    Convert graph data to shader code with informational messages.
+    Build and evaluate the node graph, reusing the result for identical graphs.
     
     Args:
-        data: Request payload containing modules and settings
-        shader_mode: Either "singlepass" or "multipass"
+        expr_dict: The SYSL module graph from the payload
+        verbose: Whether to append informational messages
+        messages: List that informational messages are appended to
     
     Returns:
-        tuple: (all_shader_bundles, messages)
+        The evaluated graph's output expression
     """
-    messages = []
-    
-    # Extract and validate modules
-    modules = data.get("modules", {})
-    if not modules or 'moduleList' not in modules or 'sysl' not in modules['moduleList']:
-        raise ValueError("Missing or invalid SYSL module data in payload")
-    
-    verbose = data.get('verbose', False)
-    expr_dict = modules['moduleList']['sysl']
-    if verbose:
-        messages.append(f"Processing SYSL graph with {len(expr_dict.get('nodes', []))} nodes")
+    cache_key = stable_hash(expr_dict)
+    expr = _GRAPH_CACHE.get(cache_key)
+    if expr is not None:
+        if verbose:
+            messages.append("Using cached node graph evaluation")
+        return expr
     
-    # Build and evaluate node graph
     node_graph = BaseNode.from_dict(expr_dict)
     if isinstance(node_graph, list) and len(node_graph) > 1:
         if verbose:
@@ -44,25 +47,76 @@ def data_to_shader(data, shader_mode="singlepass"):
         node_graph = node_graph[0]
 
     node_graph.evaluate()
-    new_expr = node_graph.outputs['expr']
+    expr = node_graph.outputs['expr']
+    _GRAPH_CACHE.set(cache_key, expr)
 
     if verbose:
         messages.append("Node graph evaluation completed successfully")
+    
+    return expr
+
+
+def _build_shader_bundles(data, expr_dict, shader_mode, verbose, messages):
+    """
+    Evaluate the node graph and compile it to shader bundles.
+    
+    Args:
+        data: Request payload containing modules and settings
+        expr_dict: The SYSL module graph from the payload
+        shader_mode: Either "singlepass" or "multipass"
+        verbose: Whether to append informational messages
+        messages: List that informational messages are appended to
+    
+    Returns:
+        all_shader_bundles
+    """
+    # Build and evaluate node graph
+    new_expr = _evaluate_graph(expr_dict, verbose, messages)
 
     # Get shader settings from request, use defaults if empty
+    # Work on a shallow copy: popping from DEFAULT_SETTINGS (or the request) would leak into later requests
     shader_settings = data.get('shaderSettings', {})
     if not shader_settings or (isinstance(shader_settings, dict) and len(shader_settings) == 0):
-        shader_settings = DEFAULT_SETTINGS
+        shader_settings = dict(DEFAULT_SETTINGS)
         if verbose:
             messages.append("Using default shader settings")
     else:
         if verbose:
             messages.append(f"Using custom shader settings with {len(shader_settings)} parameters")
+        shader_settings = dict(shader_settings)
     post_process_shader = shader_settings.pop("post_process_shader", ["part_outline_nobg"])
     # Generate shader code
     all_shader_bundles = evaluate_to_shader(new_expr, settings=shader_settings, mode=shader_mode,
          post_process_shader=post_process_shader)
     
+    return all_shader_bundles
+
+
+def data_to_shader(data, shader_mode="singlepass"):
+    """
+    Convert graph data to shader code with informational messages.
+    
+    Args:
+        data: Request payload containing modules and settings
+        shader_mode: Either "singlepass" or "multipass"
+    
+    Returns:
+        tuple: (all_shader_bundles, messages)
+    """
+    # Extract and validate modules
+    expr_dict, verbose, messages = extract_module_graph(data, 'sysl', "SYSL")
+    
+    # Identical graphs with identical settings compile to identical bundles
+    cache_key = stable_hash(expr_dict, data.get('shaderSettings', {}), shader_mode)
+    cached_bundles = _SHADER_CACHE.get(cache_key)
+    if cached_bundles is not None:
+        all_shader_bundles = copy.deepcopy(cached_bundles)
+        if verbose:
+            messages.append("Using cached shader bundles")
+    else:
+        all_shader_bundles = _build_shader_bundles(data, expr_dict, shader_mode, verbose, messages)
+        _SHADER_CACHE.set(cache_key, copy.deepcopy(all_shader_bundles))
+    
     if verbose:
         messages.append(f"Total {len(all_shader_bundles)} shader bundles generated")
         for shader_bundle in all_shader_bundles:
@@ -77,7 +131,7 @@ def data_to_shader(data, shader_mode="singlepass"):
 def generate_shader():
     """Generate shader code with HTML visualization."""
     try:
-        data = request.json or {}
+        data = payload()
         all_shader_bundles, messages = data_to_shader(data, shader_mode="multipass")
         
         # Create HTML visualization
@@ -89,22 +143,18 @@ def generate_shader():
             allow_overflow=False
         )
         
+        # Clients that render the page directly get it as-is, without the JSON envelope
+        if prefers_html():
+            return html_response(html_code)
+        
         messages.append("HTML visualization generated successfully")
 
-        return create_response(
-            content={"html": html_code},
-            messages=messages
-        )
+        return html_envelope_response(html_code, messages)
     
     except Exception as e:
-        error_info = {
-            "message": str(e),
-            "traceback": traceback.format_exc(),
-            "type": type(e).__name__
-        }
-        print(f"Error in generate_shader: {e}")
+        log.exception("Error in generate_shader: %s", e)
         return create_response(
-            error=error_info,
+            error=format_error(e),
             status_code=500
         )
 
@@ -113,40 +163,22 @@ def generate_shader():
 def generate_twgl_shader():
     """Generate TWGL-compatible shader code with configurable settings."""
     try:
-        print("Generating TWGL shader")
-        data = request.json or {}
+        data = payload()
         all_shader_bundles, messages = data_to_shader(data, shader_mode="singlepass")
         
         # Extract shader components from bundles
-        # Note: singlepass mode returns a single bundle, not a list
-        if isinstance(all_shader_bundles, tuple):
-            shader_code, uniforms, textures = all_shader_bundles
-        else:
-            # Handle case where it's a list of bundles
-            shader_bundle = all_shader_bundles[0] if isinstance(all_shader_bundles, list) else all_shader_bundles
-            shader_code = shader_bundle.get('shader_code', '')
-            uniforms = shader_bundle.get('uniforms', {})
-            textures = shader_bundle.get('textures', {})
+        content = twgl_content(all_shader_bundles)
         
         messages.append("TWGL shader code generated successfully")
         
         return create_response(
-            content={
-                "shaderCode": shader_code,
-                "uniforms": uniforms,
-                "textures": textures,
-            },
+            content=content,
             messages=messages
         )
     
     except Exception as e:
-        error_info = {
-            "message": str(e),
-            "traceback": traceback.format_exc(),
-            "type": type(e).__name__
-        }
-        print(f"Error in generate_twgl_shader: {e}")
+        log.exception("Error in generate_twgl_shader: %s", e)
         return create_response(
-            error=error_info,
+            error=format_error(e),
             status_code=500
         )
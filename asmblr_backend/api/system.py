@@ -2,20 +2,38 @@
 
 import os
 import platform
-from flask import Blueprint, jsonify
+import time
+
+import orjson
+from flask import Blueprint, Response, jsonify, request
 
 system_bp = Blueprint('system', __name__, url_prefix='/api/system')
 
+# Fixed for the lifetime of the process, so computed once at import
+_STATIC_INFO = {
+    'platform': platform.system(),
+    'release': platform.release(),
+    'python_version': platform.python_version(),
+}
+
+# Encoded /info body, reused for bursts of polls; (expires_at, body)
+INFO_TTL = 1.0
+_info_cache = (0.0, b'')
+
 @system_bp.route('/info')
 def info():
-    """Get basic system information."""
-    return jsonify({
-        'platform': platform.system(),
-        'release': platform.release(),
-        'python_version': platform.python_version(),
-        'cwd': os.getcwd(),
-        'user': os.environ.get('USER', 'unknown')
-    })
+    """Get basic system information (cached for INFO_TTL seconds; ?nocache=1 bypasses)."""
+    global _info_cache
+    now = time.monotonic()
+    expires_at, body = _info_cache
+    if now >= expires_at or request.args.get('nocache') == '1':
+        body = orjson.dumps({
+            **_STATIC_INFO,
+            'cwd': os.getcwd(),
+            'user': os.environ.get('USER', 'unknown')
+        })
+        _info_cache = (now + INFO_TTL, body)
+    return Response(body, mimetype='application/json')
 
 @system_bp.route('/env')
 def environment():
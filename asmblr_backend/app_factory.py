@@ -0,0 +1,42 @@
+"""Application factory for asmblr_backend."""
+
+import os
+from flask import Flask
+from flask_cors import CORS
+from asmblr_backend.api import register_blueprints, warmup_shaders
+from asmblr_backend.utils import configure_logging, OrjsonProvider
+
+# Optional: response compression (only if flask-compress is installed)
+try:
+    from flask_compress import Compress
+    COMPRESS_AVAILABLE = True
+except ImportError:
+    COMPRESS_AVAILABLE = False
+
+
+def create_app():
+    """Create and configure the Flask application."""
+    app = Flask(__name__)
+    app.json = OrjsonProvider(app)
+    configure_logging()
+
+    # CORS configuration
+    # WARNING: In production, replace "*" with specific allowed origins
+    # max_age lets browsers cache the preflight instead of sending OPTIONS per request
+    CORS(
+        app,
+        resources={r"/api/*": {"origins": "*"}},
+        supports_credentials=True,
+        max_age=int(os.getenv('ASMBLR_CORS_MAX_AGE', '86400')),
+    )
+
+    # Shader HTML and GLSL compress well; brotli level 5 keeps per-request cost low
+    if COMPRESS_AVAILABLE:
+        app.config.setdefault('COMPRESS_ALGORITHM', ['br', 'gzip'])
+        app.config.setdefault('COMPRESS_MIN_SIZE', 1024)
+        app.config.setdefault('COMPRESS_BR_LEVEL', 5)
+        Compress(app)
+
+    register_blueprints(app)
+    warmup_shaders()
+    return app
@@ -1,6 +1,12 @@
 """Utility modules for asmblr_backend."""
 
-from .response import create_response
+from .response import create_response, json_response, html_response, html_envelope_response, format_error
+from .request import payload, prefers_html
+from .cache import LRUCache, SQLiteCache, disk_cache, stable_hash
+from .log import configure_logging
+from .json_provider import OrjsonProvider
+from .pool import process_pool, submit
+from .shader import extract_module_graph, twgl_content
 
-__all__ = ["create_response"]
+__all__ = ["create_response", "json_response", "html_response", "html_envelope_response", "format_error", "payload", "prefers_html", "LRUCache", "SQLiteCache", "disk_cache", "stable_hash", "configure_logging", "OrjsonProvider", "process_pool", "submit", "extract_module_graph", "twgl_content"]
 
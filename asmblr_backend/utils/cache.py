@@ -0,0 +1,178 @@
+"""Bounded caching utilities: in-memory LRU with an optional SQLite tier."""
+
+import hashlib
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+import orjson
+
+log = logging.getLogger(__name__)
+
+_HASH_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+_MISSING = object()
+
+# Path of the persistent cache database; unset disables the disk tier
+DISK_CACHE_PATH = os.getenv('ASMBLR_DISK_CACHE')
+DISK_CACHE_SIZE = int(os.getenv('ASMBLR_DISK_CACHE_SIZE', '2048'))
+
+
+def stable_hash(*parts: Any) -> bytes:
+    """
+    Compute a stable digest of JSON-serializable values.
+    
+    Dict key order does not affect the result, so re-sent payloads with
+    shuffled keys map to the same digest.
+    
+    Args:
+        *parts: JSON-serializable values (numpy arrays allowed)
+    
+    Returns:
+        16-byte blake2b digest
+    """
+    return hashlib.blake2b(orjson.dumps(parts, option=_HASH_OPTIONS), digest_size=16).digest()
+
+
+class SQLiteCache:
+    """
+    Size-bounded cache persisted in a SQLite file, shared across processes.
+    
+    Values are pickled and zlib-compressed. Storage errors are logged and
+    treated as misses, so a broken cache file never fails a request. The
+    file must only be writable by the server: entries are unpickled.
+    """
+
+    # Trim the table back to maxsize every this many writes
+    PRUNE_EVERY = 64
+
+    def __init__(self, path: str, table: str, maxsize: int = 2048):
+        if not table.isidentifier():
+            raise ValueError(f"Invalid cache table name: {table!r}")
+        self.maxsize = maxsize
+        self._path = path
+        self._table = table
+        self._writes = 0
+        self._pid = None
+        with self._connection():
+            # WAL lets other server processes read while one writes
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                f'CREATE TABLE IF NOT EXISTS {table} (k BLOB PRIMARY KEY, v BLOB NOT NULL, ts REAL NOT NULL)'
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this process's connection, reopening it after a fork (e.g. gunicorn preload)."""
+        if self._pid != os.getpid():
+            self._lock = threading.Lock()
+            self._conn = sqlite3.connect(self._path, check_same_thread=False, timeout=5)
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, key: bytes, default: Any = None) -> Any:
+        """Return the stored value for key, or default."""
+        try:
+            conn = self._connection()
+            with self._lock:
+                row = conn.execute(f'SELECT v FROM {self._table} WHERE k = ?', (key,)).fetchone()
+            return pickle.loads(zlib.decompress(row[0])) if row else default
+        except Exception as e:
+            log.warning("Disk cache read failed: %s", e)
+            return default
+
+    def set(self, key: bytes, value: Any):
+        """Store a value, pruning the oldest entries beyond maxsize now and then."""
+        try:
+            blob = zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), 3)
+            conn = self._connection()
+            with self._lock, conn:
+                conn.execute(f'INSERT OR REPLACE INTO {self._table} VALUES (?, ?, ?)',
+                                   (key, blob, time.time()))
+                self._writes += 1
+                if self._writes % self.PRUNE_EVERY == 0:
+                    conn.execute(
+                        f'DELETE FROM {self._table} WHERE k NOT IN '
+                        f'(SELECT k FROM {self._table} ORDER BY ts DESC LIMIT ?)', (self.maxsize,)
+                    )
+        except Exception as e:
+            log.warning("Disk cache write failed: %s", e)
+
+
+def disk_cache(table: str) -> Optional[SQLiteCache]:
+    """Open the disk tier for table if ASMBLR_DISK_CACHE is set, else return None."""
+    if not DISK_CACHE_PATH:
+        return None
+    try:
+        return SQLiteCache(DISK_CACHE_PATH, table, DISK_CACHE_SIZE)
+    except sqlite3.Error as e:
+        log.warning("Disk cache disabled for %s: %s", table, e)
+        return None
+
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded least-recently-used cache.
+    
+    With a backing store (e.g. SQLiteCache), misses fall through to it and
+    writes go to both, so entries outlive the process.
+    """
+
+    def __init__(self, maxsize: int = 256, backing: Optional[SQLiteCache] = None):
+        self.maxsize = maxsize
+        self.backing = backing
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key (marking it recently used), or default."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                return self._data[key]
+        if self.backing is None:
+            return default
+        value = self.backing.get(key, _MISSING)
+        if value is _MISSING:
+            return default
+        self._store(key, value)
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entries beyond maxsize."""
+        self._store(key, value)
+        if self.backing is not None:
+            self.backing.set(key, value)
+
+    def _store(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for key, computing and storing it on a miss.
+        
+        The computation runs outside the lock, so concurrent misses on the
+        same key may compute twice; the last one to finish wins.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        value = compute()
+        self.set(key, value)
+        return value
+
+    def clear(self):
+        """Drop all in-memory entries (the backing store is left intact)."""
+        with self._lock:
+            self._data.clear()
@@ -0,0 +1,24 @@
+"""orjson-backed JSON provider for Flask."""
+
+from typing import Any, Union
+
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Parse and serialize through orjson instead of the stdlib json module.
+    
+    Applies to request.get_json() and jsonify(). Types orjson does not
+    handle natively fall back to Flask's default conversions. Formatting
+    options such as indent and sort_keys are ignored.
+    """
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=self.default, option=_ORJSON_OPTIONS).decode()
@@ -0,0 +1,44 @@
+"""Logging configuration utilities."""
+
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+LOG_FORMAT = '[%(asctime)s] %(levelname)s in %(name)s: %(message)s'
+
+
+def configure_logging(level: int = logging.INFO, reset: bool = False) -> Optional[QueueListener]:
+    """
+    Route asmblr_backend logs through a queue so stream writes happen off the request thread.
+    
+    Safe to call more than once; only the first call installs handlers.
+    
+    Args:
+        level: Log level for the asmblr_backend logger
+        reset: Replace existing queue handlers; needed in a forked worker,
+            where the parent's listener thread does not exist
+    
+    Returns:
+        The started QueueListener, or None if logging was already configured
+    """
+    logger = logging.getLogger('asmblr_backend')
+    if reset:
+        for handler in [h for h in logger.handlers if isinstance(h, QueueHandler)]:
+            logger.removeHandler(handler)
+    if any(isinstance(handler, QueueHandler) for handler in logger.handlers):
+        return None
+    
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    
+    logger.addHandler(QueueHandler(log_queue))
+    logger.setLevel(level)
+    logger.propagate = False
+    
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
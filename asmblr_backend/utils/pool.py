@@ -0,0 +1,50 @@
+"""Shared process pool for CPU-bound work."""
+
+import atexit
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Optional
+
+# One pool per server process, sized to the machine rather than per blueprint
+PROCESS_WORKERS = int(os.getenv('ASMBLR_PROCESS_WORKERS', str(os.cpu_count() or 1)))
+# Recycle workers after this many tasks to bound memory growth in native libraries
+# (0 keeps workers for the lifetime of the pool). Recycling uses the spawn start method.
+WORKER_MAX_TASKS = int(os.getenv('ASMBLR_WORKER_MAX_TASKS', '0'))
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def process_pool() -> ProcessPoolExecutor:
+    """
+    Return the shared process pool, creating it on first use.
+    
+    The pool is created lazily rather than at import so that pre-forking
+    servers do not inherit it into their workers.
+    
+    Returns:
+        ProcessPoolExecutor: The shared pool
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            kwargs = {'max_workers': PROCESS_WORKERS}
+            if WORKER_MAX_TASKS > 0:
+                kwargs['max_tasks_per_child'] = WORKER_MAX_TASKS
+            _pool = ProcessPoolExecutor(**kwargs)
+            atexit.register(_pool.shutdown, wait=False)
+        return _pool
+
+
+def submit(fn: Callable, *args, **kwargs) -> Future:
+    """
+    Run fn(*args, **kwargs) in the shared process pool.
+    
+    fn and its arguments must be picklable (module-level functions and
+    plain data or picklable objects).
+    
+    Returns:
+        Future: The pending result
+    """
+    return process_pool().submit(fn, *args, **kwargs)
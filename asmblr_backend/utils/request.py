@@ -0,0 +1,34 @@
+"""Request parsing utilities."""
+
+from flask import request
+
+
+def payload() -> dict:
+    """
+    Return the current request's JSON body as a dict.
+    
+    Empty bodies short-circuit without invoking the JSON parser; missing,
+    malformed or non-object bodies yield an empty dict. The parsed body is
+    cached on the request, so repeated calls are cheap.
+    
+    Returns:
+        dict: The parsed JSON object, or {}
+    """
+    if request.content_length == 0:
+        return {}
+    
+    data = request.get_json(silent=True, cache=True)
+    return data if isinstance(data, dict) else {}
+
+
+def prefers_html() -> bool:
+    """
+    Check whether the client asked for raw HTML rather than the JSON envelope.
+    
+    Only an explicit best match counts, so wildcard Accept headers keep
+    the JSON response.
+    
+    Returns:
+        bool: True if text/html is the client's preferred mimetype
+    """
+    return request.accept_mimetypes.best == 'text/html'
@@ -1,15 +1,85 @@
 """Standardized API response utilities."""
 
-from flask import jsonify
+import traceback
+import orjson
+from flask import Response
 from typing import Any, Optional
 
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+# Characters of HTML encoded per chunk when streaming an HTML envelope
+HTML_STREAM_CHUNK = 64 * 1024
+
+# Client-visible tracebacks keep only the innermost frames, capped in size
+TRACEBACK_FRAMES = 6
+TRACEBACK_MAX_CHARS = 4096
+
+
+def json_response(data: Any, status_code: int = 200) -> Response:
+    """
+    Serialize data to a JSON response using orjson.
+    
+    Faster than ``jsonify`` for large, float-heavy payloads and natively
+    handles numpy arrays and scalars.
+    
+    Args:
+        data: JSON-serializable data (numpy arrays allowed)
+        status_code: HTTP status code
+    
+    Returns:
+        Flask Response with application/json mimetype
+    """
+    return Response(orjson.dumps(data, option=_ORJSON_OPTIONS), status=status_code, mimetype='application/json')
+
+
+def html_response(html: str, status_code: int = 200) -> Response:
+    """
+    Return HTML as a text/html response, without the JSON envelope.
+    
+    Skips JSON-encoding (and escaping) large shader pages for clients that
+    render them directly.
+    
+    Args:
+        html: The HTML document
+        status_code: HTTP status code
+    
+    Returns:
+        Flask Response with text/html mimetype
+    """
+    return Response(html, status=status_code, mimetype='text/html')
+
+
+def html_envelope_response(html: str, messages: Optional[list[str]] = None) -> Response:
+    """
+    Stream an HTML page inside the standard envelope, as content.html.
+    
+    The page is JSON-escaped slice by slice while the response is sent, so
+    the fully encoded copy of a multi-MB page is never held in memory.
+    The body is identical to create_response(content={"html": html}, ...).
+    
+    Args:
+        html: The HTML document
+        messages: List of informational messages to show as notifications
+    
+    Returns:
+        Flask Response streaming application/json
+    """
+    def generate():
+        yield b'{"content":{"html":"'
+        for start in range(0, len(html), HTML_STREAM_CHUNK):
+            # JSON escaping is per character, so escaped slices concatenate cleanly
+            yield orjson.dumps(html[start:start + HTML_STREAM_CHUNK])[1:-1]
+        yield b'"},"messages":' + orjson.dumps(messages or []) + b',"error":null}'
+    
+    return Response(generate(), mimetype='application/json')
+
 
 def create_response(
     content: Optional[Any] = None,
     messages: Optional[list[str]] = None,
     error: Optional[Any] = None,
     status_code: int = 200
-):
+) -> Response:
     """
     Create standardized API response with content, messages, and error handling.
     
@@ -20,7 +90,7 @@ def create_response(
         status_code: HTTP status code
     
     Returns:
-        Flask response tuple with (jsonified data, status_code)
+        Flask response with standardized format (orjson-encoded)
     """
     response_data = {
         "content": content,
@@ -28,5 +98,32 @@ def create_response(
         "error": error
     }
     
-    return jsonify(response_data), status_code
+    return json_response(response_data, status_code)
+
 
+def format_error(e: BaseException) -> dict:
+    """
+    Build the standardized error payload for an exception.
+    
+    Only the innermost TRACEBACK_FRAMES frames are included, and the
+    traceback text is capped at TRACEBACK_MAX_CHARS, so error responses
+    stay small. Log the exception separately for the full traceback.
+    
+    Args:
+        e: The caught exception
+    
+    Returns:
+        dict with message, traceback and type
+    """
+    # A negative limit keeps the innermost frames without reading source lines for the rest
+    frames = traceback.extract_tb(e.__traceback__, limit=-TRACEBACK_FRAMES)
+    tb = ''.join(
+        ["Traceback (most recent call last):\n"]
+        + traceback.format_list(frames)
+        + traceback.format_exception_only(type(e), e)
+    )
+    return {
+        "message": str(e),
+        "traceback": tb[-TRACEBACK_MAX_CHARS:],
+        "type": type(e).__name__
+    }
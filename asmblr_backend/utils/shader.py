@@ -0,0 +1,60 @@
+"""Shader bundle helpers shared by the shader generation endpoints."""
+
+from typing import Any
+
+
+def extract_module_graph(data: dict, module: str, label: str) -> tuple:
+    """
+    Validate a shader request and pull out one module's graph.
+    
+    Args:
+        data: Request payload containing modules and settings
+        module: Key of the module in modules.moduleList (e.g. "sysl")
+        label: Human-readable module name for messages
+    
+    Returns:
+        tuple: (module_graph, verbose, messages)
+    
+    Raises:
+        ValueError: If the payload has no graph for the module
+    """
+    messages = []
+    
+    try:
+        module_graph = data["modules"]["moduleList"][module]
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Missing or invalid {label} module data in payload") from e
+    
+    verbose = data.get('verbose', False)
+    if verbose:
+        messages.append(f"Processing {label} graph with {len(module_graph.get('nodes', []))} nodes")
+    
+    return module_graph, verbose, messages
+
+
+def twgl_content(all_shader_bundles: Any) -> dict:
+    """
+    Extract the TWGL response content from compiled shader bundles.
+    
+    Accepts either a (shader_code, uniforms, textures) tuple, a single
+    bundle dict, or a list of bundle dicts (the first is used).
+    
+    Args:
+        all_shader_bundles: Output of a data_to_shader call
+    
+    Returns:
+        dict with shaderCode, uniforms and textures
+    """
+    if isinstance(all_shader_bundles, tuple):
+        shader_code, uniforms, textures = all_shader_bundles
+    else:
+        shader_bundle = all_shader_bundles[0] if isinstance(all_shader_bundles, list) else all_shader_bundles
+        shader_code = shader_bundle.get('shader_code', '')
+        uniforms = shader_bundle.get('uniforms', {})
+        textures = shader_bundle.get('textures', {})
+    
+    return {
+        "shaderCode": shader_code,
+        "uniforms": uniforms,
+        "textures": textures,
+    }
@@ -0,0 +1,51 @@
+"""
+Gunicorn configuration for asmblr_backend.
+
+Usage:
+    gunicorn -c scripts/gunicorn_conf.py
+
+Shader compilation holds the GIL for most of its run, so throughput comes
+from worker processes; threads let each worker overlap requests that wait
+on the decor_gumi process pool or on I/O. Each worker keeps its own
+caches, process pool and command store (set REDIS_URL to share commands).
+The app is preloaded in the master; thread pools and the decor_gumi process
+pool start lazily, and the disk cache reopens its connection per process, so
+none of them cross the fork.
+"""
+
+import multiprocessing
+import os
+
+_here = os.path.dirname(os.path.abspath(__file__))
+
+wsgi_app = "app:app"
+pythonpath = f"{_here},{os.path.dirname(_here)}"
+
+bind = os.getenv("ASMBLR_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("ASMBLR_WORKERS", str(multiprocessing.cpu_count())))
+worker_class = "gthread"
+threads = int(os.getenv("ASMBLR_THREADS", "4"))
+
+# Multipass compiles and joint validation can take well over the 30s default
+timeout = int(os.getenv("ASMBLR_TIMEOUT", "120"))
+
+# Build the app once in the master; workers share its imports copy-on-write
+preload_app = True
+
+# Warm up in the master before forking rather than in a create_app() thread
+# that could be mid-compile (holding locks) when workers fork
+_warmup = os.getenv("ASMBLR_WARMUP", "1") != "0"
+os.environ["ASMBLR_WARMUP"] = "0"
+
+
+def when_ready(server):
+    """Compile the warm-up shader in the master so every worker starts warm."""
+    if _warmup:
+        from asmblr_backend.api.migumi import warmup
+        warmup()
+
+
+def post_fork(server, worker):
+    """Restart per-process threads; the master's logging listener is not forked."""
+    from asmblr_backend.utils import configure_logging
+    configure_logging(reset=True)